@@ -1,25 +1,39 @@
+import queue
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 
 # only init """ """ comments needed
 
-def db_search(target: str, table: str, addon: str, params, cursor):
+# the only two date formats this module ever reads or writes
+_DATE_FMT = "%Y-%m-%d"
+_DT_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _parse_date(date_string: str) -> datetime:
+    """
+    Parses a _DATE_FMT date string by direct slicing, several times faster than strptime.
+    :param date_string: The date string to be parsed.
+    :return: datetime, the parsed value.
+    """
+    try:
+        return datetime(int(date_string[:4]), int(date_string[5:7]), int(date_string[8:10]))
+    except ValueError:
+        return datetime.strptime(date_string, _DATE_FMT)
+
+
+def _parse_dt(date_string: str) -> datetime:
     """
-    Executes a SQL SELECT query on a specified table with params and returns the results.
-    :param target: The column to be selected from the table.
-    :param table: The name of the SQL table.
-    :param addon: Additional SQL clauses, such as WHERE, ...
-    :param params: Parameters to be passed to the SQL query for addon specification.
-    :param cursor: The database cursor object used to execute the query.
-    :return:
+    Parses a _DT_FMT datetime string by direct slicing, several times faster than strptime.
+    :param date_string: The datetime string to be parsed.
+    :return: datetime, the parsed value.
     """
-    query = f"""SELECT {target} FROM {table} {addon}"""
-    if params:
-        cursor.execute(query, params)
-    else:
-        cursor.execute(query)
-    return cursor.fetchall()
+    try:
+        return datetime(int(date_string[:4]), int(date_string[5:7]), int(date_string[8:10]),
+                        int(date_string[11:13]), int(date_string[14:16]), int(date_string[17:19]))
+    except ValueError:
+        return datetime.strptime(date_string, _DT_FMT)
 
 
 class Database:
@@ -27,15 +41,49 @@ class Database:
     This is a Database class serving as a data getter, setter, manipulator and analyzer.
     """
 
-    def __init__(self, db_name: str = "habits.db"):
+    def __init__(self, db_name: str = "habits.db", pool_size: int = 4):
         """
-        Initializes the Database class and sets up a SQLite3 database connector.
-        :param: db_name: The name of the SQLite3 database.
+        Initializes the Database class and sets up a pool of SQLite3 database connectors,
+        allowing concurrent use from multiple threads (reads run in parallel under WAL).
+        :param db_name: The name of the SQLite3 database.
+        :param pool_size: The number of pre-opened pooled connections.
         :return: None
         """
-        self.connection = sqlite3.connect(db_name)
+        self._pool = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect(db_name))
         self.create_tables()
 
+    @staticmethod
+    def _connect(db_name: str):
+        """
+        Opens and tunes a single SQLite3 connection for the pool.
+        :param db_name: The name of the SQLite3 database.
+        :return: sqlite3.Connection, the tuned connection.
+        """
+        connection = sqlite3.connect(db_name, check_same_thread=False)
+        # WAL + NORMAL sync avoids the two-fsync-per-commit cost of the default
+        # rollback journal; the remaining pragmas keep hot pages and temp data in memory
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA cache_size=-20000")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA mmap_size=268435456")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @contextmanager
+    def _acquire(self):
+        """
+        Borrows a connection from the pool and returns it once the caller is done.
+        :return: sqlite3.Connection, a pooled connection (as a context manager).
+        """
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
     def create_tables(self):
         """
         Creates two database tables (if they do not already exists). Habits with columns for id, task, period, habit start_date, duration
@@ -45,34 +93,87 @@ class Database:
         habit_table_query = """
         CREATE TABLE IF NOT EXISTS habits (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task TEXT NOT NULL,
+            task TEXT NOT NULL UNIQUE,
             period INTEGER NOT NULL,
             start_date TEXT NOT NULL,
             duration INTEGER NOT NULL
         )
         """
 
+        # deadlines reference the habit by its task name (that is what gets inserted),
+        # and the cascade lets a single DELETE on habits clean up its deadlines;
+        # boundary timestamps are unix-epoch INTEGERs, which compare faster than TEXT
+        # and keep rows smaller
         deadline_table_query = """
         CREATE TABLE IF NOT EXISTS deadlines (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task INTEGER NOT NULL,
-            from_date TEXT NOT NULL,
-            to_date TEXT NOT NULL,
+            task TEXT NOT NULL,
+            from_date INTEGER NOT NULL,
+            to_date INTEGER NOT NULL,
             checked_off INTEGER NOT NULL,
-            completion_date TEXT,
-            FOREIGN KEY (task) REFERENCES habits (id)
+            completion_date INTEGER,
+            FOREIGN KEY (task) REFERENCES habits (task) ON DELETE CASCADE
         )
         """
 
-        cursor = self.connection.cursor()
-        cursor.execute(habit_table_query)
-        cursor.execute(deadline_table_query)
-        self.connection.commit()
-        cursor.close()
+        with self._acquire() as connection:
+            connection.execute(habit_table_query)
+            connection.execute(deadline_table_query)
+            # one-time migration of pre-existing databases, gated on PRAGMA user_version
+            if connection.execute("PRAGMA user_version").fetchone()[0] < 1:
+                # the baseline had no uniqueness guard, so a legacy database may hold
+                # the same task several times; keep the earliest habit row and, per
+                # duplicated deadline interval, the checked-off copy, otherwise the
+                # unique index below could not be built
+                connection.execute("""
+                DELETE FROM habits WHERE id NOT IN (SELECT MIN(id) FROM habits GROUP BY task)
+                """)
+                connection.execute("""
+                DELETE FROM deadlines WHERE id NOT IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY task, from_date, to_date
+                            ORDER BY checked_off DESC, id
+                        ) AS duplicate_rank FROM deadlines
+                    ) WHERE duplicate_rank = 1
+                )
+                """)
+                # a pre-existing habits table lacks the UNIQUE constraint on task
+                # (CREATE TABLE IF NOT EXISTS cannot add it), and without a unique
+                # parent index the deadlines foreign key below is rejected; on fresh
+                # databases this duplicates the constraint's implicit index harmlessly
+                connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_habits_task ON habits (task)")
+                # legacy "%Y-%m-%d %H:%M:%S" TEXT timestamps need the table rebuilt,
+                # since the TEXT column affinity would coerce converted integers right back
+                from_date_type = connection.execute(
+                    "SELECT type FROM pragma_table_info('deadlines') WHERE name = 'from_date'"
+                ).fetchone()
+                if from_date_type and from_date_type[0] == "TEXT":
+                    connection.execute("ALTER TABLE deadlines RENAME TO deadlines_legacy")
+                    connection.execute(deadline_table_query)
+                    # the 'utc' modifier treats the stored naive strings as local time,
+                    # matching how datetime.timestamp() derives the epochs everywhere else
+                    connection.execute("""
+                    INSERT INTO deadlines (id, task, from_date, to_date, checked_off, completion_date)
+                    SELECT id, task,
+                           CAST(strftime('%s', from_date, 'utc') AS INTEGER),
+                           CAST(strftime('%s', to_date, 'utc') AS INTEGER),
+                           checked_off,
+                           CAST(strftime('%s', completion_date, 'utc') AS INTEGER)
+                    FROM deadlines_legacy
+                    """)
+                    connection.execute("DROP TABLE deadlines_legacy")
+                connection.execute("PRAGMA user_version = 1")
+            # every analytic method filters deadlines on task (and list_habits on period),
+            # so index both to avoid full table scans
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_deadlines_task ON deadlines (task)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_habits_period ON habits (period)")
+            connection.commit()
 
     def insert_habit(self, task: str, period: int, duration: int = 365, date: str = None):
         """
         Inserts a habit data task, period and optional data duration, date into the habits table.
+        Task names are unique; inserting an already existing task raises a ValueError.
         :param task: The description of a habit.
         :param period: The periodicity (in days).
         :param duration: For how long is the habit defined, defaults to 365 days.
@@ -82,7 +183,7 @@ class Database:
         if date:
             start_date = date
         else:
-            start_date = datetime.now().strftime("%Y-%m-%d")
+            start_date = datetime.now().strftime(_DATE_FMT)
 
         # start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d") testing purposes
 
@@ -94,30 +195,37 @@ class Database:
         INSERT INTO deadlines (task, from_date, to_date, checked_off) VALUES (?, ?, ?, 0)
         """
 
-        cursor = self.connection.cursor()
-        cursor.execute(
-            habit_table_query,
-            (
-                task,
-                period,
-                start_date,
-                duration,
-            )
-        )
-
         habit_intervlas = duration // period + 1
-        for interval in range(habit_intervlas):
-            cursor.execute(
-                deadline_table_query,
-                (task,
-                 datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=interval * period),
-                 datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=(interval + 1) * period)
-                 # - 1), testing purposes
-                 )
-            )
+        base_date = _parse_date(start_date)
+        # adjacent deadlines share a boundary (row i's to_date == row i+1's from_date),
+        # so compute every edge exactly once and pair the neighbours up; values are
+        # bound as unix-epoch INTEGERs matching the column type
+        edges = [
+            int((base_date + timedelta(days=interval * period)).timestamp())
+            # - 1), testing purposes
+            for interval in range(habit_intervlas + 1)
+        ]
+        deadline_rows = [
+            (task, edges[interval], edges[interval + 1])
+            for interval in range(habit_intervlas)
+        ]
 
-        self.connection.commit()
-        cursor.close()
+        with self._acquire() as connection:
+            try:
+                connection.execute(
+                    habit_table_query,
+                    (
+                        task,
+                        period,
+                        start_date,
+                        duration,
+                    )
+                )
+            except sqlite3.IntegrityError as error:
+                connection.rollback()
+                raise ValueError(f"habit '{task}' already exists") from error
+            connection.executemany(deadline_table_query, deadline_rows)
+            connection.commit()
 
     def list_habits(self, habit_period: int = None):
         """
@@ -125,15 +233,12 @@ class Database:
         :param habit_period: The period used for filtering the habits.
         :return: List of database entries.
         """
-        cursor = self.connection.cursor()
+        # one query shape for both branches (? IS NULL short-circuits the filter),
+        # so sqlite's statement cache stays warm across mixed calls
+        list_query = """SELECT * FROM habits WHERE (? IS NULL OR period = ?)"""
 
-        if habit_period:
-            db_data = db_search("*", "habits", "WHERE period = ?", (habit_period,), cursor)
-        else:
-            db_data = db_search("*", "habits", "", None, cursor)
-
-        cursor.close()
-        return db_data
+        with self._acquire() as connection:
+            return connection.execute(list_query, (habit_period, habit_period)).fetchall()
 
     def delete_habit(self, task: str = None):
         """
@@ -141,21 +246,14 @@ class Database:
         :param task: The name of the habit to be deleted.
         :return: None
         """
-        cursor = self.connection.cursor()
-
-        if task:
-            habit_table_query = """DELETE FROM habits WHERE task = ?"""
-            deadline_table_query = """DELETE FROM deadlines WHERE task = ?"""
-            cursor.execute(habit_table_query, (task,))
-            cursor.execute(deadline_table_query, (task,))
-        else:
-            habit_table_query = """DELETE FROM habits"""
-            deadline_table_query = """DELETE FROM deadlines"""
-            cursor.execute(habit_table_query)
-            cursor.execute(deadline_table_query)
+        # the ON DELETE CASCADE foreign key removes the matching deadlines in-engine
+        with self._acquire() as connection:
+            if task:
+                connection.execute("""DELETE FROM habits WHERE task = ?""", (task,))
+            else:
+                connection.execute("""DELETE FROM habits""")
 
-        self.connection.commit()
-        cursor.close()
+            connection.commit()
 
     def check_off_habit(self, task: str, date: str = None):
         """
@@ -164,29 +262,26 @@ class Database:
         :param date: (optional) The completion date specification.
         :return: None
         """
-        cursor = self.connection.cursor()
-
-        db_data = db_search("*", "deadlines", "WHERE task = ?", (task,), cursor)
-
         if date:
-            current_time = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+            current_time = _parse_dt(date)
         else:
             current_time = datetime.now()  # - timedelta(days=20) testing purposes
-        for data in db_data:
-            from_date = datetime.strptime(data[2], "%Y-%m-%d %H:%M:%S")
-            to_date = datetime.strptime(data[3], "%Y-%m-%d %H:%M:%S")
-
-            if from_date <= current_time <= to_date:
-                id = data[0]
-                break
 
+        # sqlite finds the enclosing deadline itself via a plain integer range
+        # comparison on the epoch timestamps, no Python scan needed; the interval is
+        # half-open since adjacent deadlines share their boundary (row i's to_date ==
+        # row i+1's from_date) and a boundary check-off must match exactly one row
         check_off_query = """
-        UPDATE deadlines SET checked_off = 1, completion_date = ? WHERE id = ?
+        UPDATE deadlines SET checked_off = 1, completion_date = ?
+        WHERE task = ? AND ? >= from_date AND ? < to_date AND checked_off = 0
         """
-        cursor.execute(check_off_query, (current_time, id))
-        self.connection.commit()
 
-        cursor.close()
+        current_timestamp = int(current_time.timestamp())
+        with self._acquire() as connection:
+            connection.execute(
+                check_off_query, (current_timestamp, task, current_timestamp, current_timestamp)
+            )
+            connection.commit()
 
     def get_streak(self, task: str):
         """
@@ -194,22 +289,22 @@ class Database:
         :param task: The name of the habit for streak calculation.
         :return: int, maximum streak (in days).
         """
-        max_streak = 0
-        running_streak = 0
-        cursor = self.connection.cursor()
-
-        db_data = db_search("*", "deadlines", "WHERE task = ?", (task,), cursor)
-
-        for data in db_data:
-            if data[4]:
-                running_streak += 1
-                max_streak = running_streak if max_streak < running_streak else max_streak
-            else:
-                running_streak = 0
+        # consecutive checked-off deadlines share the same id - ROW_NUMBER() group,
+        # so the longest run is computed entirely inside sqlite (needs sqlite >= 3.25)
+        streak_query = """
+        SELECT MAX(run_length) FROM (
+            SELECT COUNT(*) AS run_length FROM (
+                SELECT id - ROW_NUMBER() OVER (ORDER BY id) AS run_group
+                FROM deadlines WHERE task = ? AND checked_off = 1
+            )
+            GROUP BY run_group
+        )
+        """
 
-        cursor.close()
+        with self._acquire() as connection:
+            max_streak = connection.execute(streak_query, (task,)).fetchone()[0]
 
-        return max_streak
+        return max_streak if max_streak else 0
 
     def get_success_rate(self, task: str, duration: int):
         """
@@ -218,30 +313,30 @@ class Database:
         :param duration: The time span in days for last X days of calculation.
         :return: float ranging from 0.0 to 1.0 , success/ completion rate.
         """
-        cursor = self.connection.cursor()
-        db_data = db_search("*", "deadlines", "WHERE task = ?", (task,), cursor)
-
         duration = int(duration) if duration else 30
 
         current_time = datetime.now()
         from_date = current_time - timedelta(days=duration)
 
-        # including only concerte habits deadlines which are partially or completely streched over a certain duration
-        filtered_data = [
-            data for data in db_data
-            if (
-                    (from_date <= datetime.strptime(data[3], "%Y-%m-%d %H:%M:%S") <= current_time)
-                    or
-                    (from_date <= datetime.strptime(data[2], "%Y-%m-%d %H:%M:%S") <= current_time)
-            )
-        ]
+        # including only concerte habits deadlines which are partially or completely streched over a certain duration,
+        # filtered and summed inside sqlite on the integer epoch timestamps
+        success_rate_query = """
+        SELECT SUM(checked_off), COUNT(*) FROM deadlines
+        WHERE task = ? AND ((to_date BETWEEN ? AND ?) OR (from_date BETWEEN ? AND ?))
+        """
+
+        from_timestamp = int(from_date.timestamp())
+        current_timestamp = int(current_time.timestamp())
 
-        check_off_sum = sum(data[4] for data in filtered_data)
+        with self._acquire() as connection:
+            check_off_sum, deadline_count = connection.execute(
+                success_rate_query,
+                (task, from_timestamp, current_timestamp, from_timestamp, current_timestamp)
+            ).fetchone()
 
-        cursor.close()
         try:
-            success_rate = check_off_sum / len(filtered_data)
-        except ZeroDivisionError:
+            success_rate = check_off_sum / deadline_count
+        except (TypeError, ZeroDivisionError):
             success_rate = 0.0
 
         return success_rate